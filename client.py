@@ -4,6 +4,7 @@ import time
 from congestion import CongestionController
 from crypto import SimpleCrypto
 from logs import save_log
+from streams import StreamScheduler
 
 
 TYPE_DATA = 0  # Igual no server.py
@@ -11,7 +12,7 @@ TYPE_ACK = 1  # Igual no server.py
 TYPE_NONCE_REQ = 2  # Cliente solicita início do handshake
 TYPE_NONCE_RESP = 3  # Servidor responde com seu nonce
 
-HEADER_FMT = "!BIIHH"
+HEADER_FMT = "!BIIHHHI"  # type, seq, ack, rwnd, length, stream_id, stream_seq
 HEADER_SIZE = struct.calcsize(HEADER_FMT)
 PAYLOAD_SIZE = 1000
 TIMEOUT = 0.2
@@ -20,15 +21,20 @@ CLIENT_LOG_DIR = "client_logs"
 
 
 # Monta bytes do pacote (Header + Payload)
-def make_data(seq: int, payload: bytes) -> bytes:
-    return struct.pack(HEADER_FMT, TYPE_DATA, seq, 0, 0, len(payload)) + payload
+def make_data(seq: int, stream_id: int, stream_seq: int, payload: bytes) -> bytes:
+    return (
+        struct.pack(HEADER_FMT, TYPE_DATA, seq, 0, 0, len(payload), stream_id, stream_seq)
+        + payload
+    )
 
 def parse_packet(data: bytes):
     if len(data) < HEADER_SIZE:
         return None
-    ptype, seq, ack, rwnd, length = struct.unpack(HEADER_FMT, data[:HEADER_SIZE])
+    ptype, seq, ack, rwnd, length, stream_id, stream_seq = struct.unpack(
+        HEADER_FMT, data[:HEADER_SIZE]
+    )
     payload = data[HEADER_SIZE:HEADER_SIZE + length]
-    return ptype, seq, ack, rwnd, payload
+    return ptype, seq, ack, rwnd, stream_id, stream_seq, payload
 
 
 def crypto_handshake(sock, server, crypto: SimpleCrypto) -> bool:
@@ -41,7 +47,8 @@ def crypto_handshake(sock, server, crypto: SimpleCrypto) -> bool:
 
     # Envia pedido de handshake com o nonce
     nonce_req = (
-        struct.pack(HEADER_FMT, TYPE_NONCE_REQ, 0, 0, 0, len(client_nonce)) + client_nonce
+        struct.pack(HEADER_FMT, TYPE_NONCE_REQ, 0, 0, 0, len(client_nonce), 0, 0)
+        + client_nonce
     )
     sock.sendto(nonce_req, server)
 
@@ -51,7 +58,7 @@ def crypto_handshake(sock, server, crypto: SimpleCrypto) -> bool:
         data, _ = sock.recvfrom(65535)
         parsed = parse_packet(data)
         if parsed:
-            ptype, seq, ack, rwnd, payload = parsed
+            ptype, seq, ack, rwnd, stream_id, stream_seq, payload = parsed
             if ptype == TYPE_NONCE_RESP and len(payload) >= 16:
                 server_nonce = payload[:16]
                 # Deriva a chave de sessão
@@ -70,7 +77,23 @@ def crypto_handshake(sock, server, crypto: SimpleCrypto) -> bool:
     return False
 
 
-def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
+def run_client(
+    server_host="127.0.0.1",
+    server_port=9000,
+    total_packets=10000,
+    num_streams=4,
+    stream_weights=None,
+):
+    """
+    Cliente UDP com múltiplos streams independentes em uma mesma conexão.
+
+    Args:
+        server_host: Endereço do servidor
+        server_port: Porta do servidor
+        total_packets: Número de pacotes a enviar (divididos entre os streams)
+        num_streams: Número de streams da conexão
+        stream_weights: Pesos do round-robin por stream (padrão: todos 1)
+    """
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
     sock.settimeout(0.05)  #Cliente não fica travado esperando um ACK. Se nada chegar em 0.05, ele continua executando a lógica de retransmissão e controle
@@ -98,7 +121,19 @@ def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
         {}
     )  # seq -> (packet_bytes, send_time) - Pacotes enviados, mas ainda não confirmados. guarda bytes para a retransmissão.
 
-    cc = CongestionController()  # Controlador de congestionamento dinâmico
+    cc = CongestionController()  # Controlador de congestionamento dinâmico (compartilhado pelos streams)
+
+    # Streams: cada um com sua própria sequência; o escalonador escolhe
+    # qual stream ocupa o próximo slot livre da cwnd
+    scheduler = StreamScheduler()
+    if stream_weights is None:
+        stream_weights = [1] * num_streams
+    for stream_id in range(num_streams):
+        stream = scheduler.add_stream(stream_id, stream_weights[stream_id])
+        # Divide os pacotes igualmente entre os streams
+        stream.write(
+            total_packets // num_streams + (1 if stream_id < total_packets % num_streams else 0)
+        )
 
     # Estatísticas
     total_packets_sent = 0  # Total de pacotes enviados (incluindo retransmissões)
@@ -109,14 +144,17 @@ def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
 
     start = time.time()
 
-    def send_packet(seq: int):
+    def send_packet(seq: int, stream_id: int, stream_seq: int):
         nonlocal total_packets_sent
 
         payload = (
             bytes([seq % 256]) * PAYLOAD_SIZE
         )  # Byte com valor entre 0 a 255 repetido 1000 vezes. Payload com 1000 bytes repetidos. (Só para teste)
 
-        save_log(CLIENT_LOG_DIR, f"[client] sending packet seq={seq}")
+        save_log(
+            CLIENT_LOG_DIR,
+            f"[client] sending packet seq={seq} stream={stream_id} stream_seq={stream_seq}",
+        )
         save_log(CLIENT_LOG_DIR, f"[payload] {payload.hex()[0:7]}", type="payload")
 
         # Cifra o payload
@@ -128,7 +166,7 @@ def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
             type="payload",
         )
 
-        pkt = make_data(seq, encrypted_payload)
+        pkt = make_data(seq, stream_id, stream_seq, encrypted_payload)
         sock.sendto(pkt, server)
         inflight[seq] = (pkt, time.time())
         total_packets_sent += 1
@@ -140,7 +178,10 @@ def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
 
         # Envia enquanto houver espaço na janela
         while next_seq < total_packets and (next_seq - send_base) < effective_window:
-            send_packet(next_seq)
+            stream = scheduler.next_stream()
+            if stream is None:
+                break
+            send_packet(next_seq, stream.stream_id, stream.take())
             next_seq += 1
 
         # Tenta receber ACK(s)
@@ -148,7 +189,7 @@ def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
             data, _ = sock.recvfrom(65535)
             parsed = parse_packet(data)
             if parsed:
-                ptype, seq, ack, rwnd, payload = parsed
+                ptype, seq, ack, rwnd, stream_id, stream_seq, payload = parsed
                 if ptype == TYPE_ACK:
 
                     peer_rwnd = rwnd
@@ -242,6 +283,7 @@ def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
     print(f"Cwnd máximo: {max_cwnd:.2f}")
     print(f"Cwnd médio: {avg_cwnd:.2f}")
     print(f"Estado final: {cc.state}")
+    print(f"Streams: {num_streams} | pesos: {stream_weights}")
     print("=" * 80 + "\n")
 
     save_log(CLIENT_LOG_DIR, "\n" + "=" * 80)
@@ -261,6 +303,7 @@ def run_client(server_host="127.0.0.1", server_port=9000, total_packets=10000):
     save_log(CLIENT_LOG_DIR, f"Cwnd máximo: {max_cwnd:.2f}")
     save_log(CLIENT_LOG_DIR, f"Cwnd médio: {avg_cwnd:.2f}")
     save_log(CLIENT_LOG_DIR, f"Estado final: {cc.state}")
+    save_log(CLIENT_LOG_DIR, f"Streams: {num_streams} | pesos: {stream_weights}")
     save_log(CLIENT_LOG_DIR, "=" * 80)
 
 
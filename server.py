@@ -4,6 +4,7 @@ import random
 import time
 from crypto import SimpleCrypto
 from logs import save_log
+from streams import ReceiveStream
 
 TYPE_DATA = 0
 TYPE_ACK = 1
@@ -11,7 +12,7 @@ TYPE_NONCE_REQ = 2  # Cliente solicita início do handshake
 TYPE_NONCE_RESP = 3  # Servidor responde com seu nonce
 
 #Define o formato do header
-HEADER_FMT = "!BIIHH"  # type(1), seq(4), ack(4), rwnd(2) lenght(2)
+HEADER_FMT = "!BIIHHHI"  # type(1), seq(4), ack(4), rwnd(2) lenght(2) stream_id(2) stream_seq(4)
 HEADER_SIZE = struct.calcsize(HEADER_FMT) # Calcula quantos bytes o header tem no total
 
 RECV_BUFFER_PKTS = 5
@@ -21,18 +22,20 @@ SERVER_LOG_DIR = "server_logs"
 
 #Empacota os valores e transforma em uma sequência de bytes
 def make_ack(expected_seq: int, rwnd:int) -> bytes:
-    return struct.pack(HEADER_FMT, TYPE_ACK, 0, expected_seq, rwnd, 0)
+    return struct.pack(HEADER_FMT, TYPE_ACK, 0, expected_seq, rwnd, 0, 0, 0)
 
 
 def parse_packet(data: bytes):
     if len(data) < HEADER_SIZE:
         return None
     
-    ptype, seq, ack, rwnd, length = struct.unpack(HEADER_FMT, data[:HEADER_SIZE])
+    ptype, seq, ack, rwnd, length, stream_id, stream_seq = struct.unpack(
+        HEADER_FMT, data[:HEADER_SIZE]
+    )
 
     payload = data[HEADER_SIZE:HEADER_SIZE+length]
 
-    return ptype, seq, ack, rwnd, payload
+    return ptype, seq, ack, rwnd, stream_id, stream_seq, payload
 
 
 def run_server(host="0.0.0.0", port=9000, packet_loss_rate=0.0):
@@ -54,11 +57,11 @@ def run_server(host="0.0.0.0", port=9000, packet_loss_rate=0.0):
     save_log(SERVER_LOG_DIR, f"Server started on {host}:{port}")
     save_log(SERVER_LOG_DIR, f"Packet loss rate: {packet_loss_rate * 100:.1f}%")
 
-    expected_seq = 0
+    expected_seq = 0  # seq da conexão: usado apenas para o ACK cumulativo
 
-    buffer = (
-        {}
-    )  # seq: payload (Serve oara armazenar as sequncias que chegaram fora de ordem)
+    received = set()  # seqs da conexão que chegaram fora de ordem (só para o ACK)
+
+    streams = {}  # stream_id -> ReceiveStream (cada um com sua reordenação)
 
     client_addr = None
     delivered = 0
@@ -80,7 +83,7 @@ def run_server(host="0.0.0.0", port=9000, packet_loss_rate=0.0):
         if not parsed:
             continue
 
-        ptype, seq, ack, rwnd, payload = parsed 
+        ptype, seq, ack, rwnd, stream_id, stream_seq, payload = parsed
 
         # Handshake de criptografia
         if ptype == TYPE_NONCE_REQ:
@@ -94,7 +97,7 @@ def run_server(host="0.0.0.0", port=9000, packet_loss_rate=0.0):
 
                 # Envia o nonce do servidor de volta
                 nonce_resp = (
-                    struct.pack(HEADER_FMT, TYPE_NONCE_RESP, 0, 0,0, len(server_nonce))
+                    struct.pack(HEADER_FMT, TYPE_NONCE_RESP, 0, 0, 0, len(server_nonce), 0, 0)
                     + server_nonce
                 )
                 sock.sendto(nonce_resp, addr)
@@ -134,31 +137,33 @@ def run_server(host="0.0.0.0", port=9000, packet_loss_rate=0.0):
                 type="payload",
             )
 
-        # Reordenação + entrega ordenada
-        if seq == expected_seq:
-            # entrega este e todos os consecutivos do buffer
-            delivered += 1
-            expected_seq += 1
-
-            while expected_seq in buffer:
-                buffer.pop(expected_seq)
-                delivered += 1
+        # Duplicata (retransmissão de algo que já chegou): apenas reenvia o ACK
+        if seq >= expected_seq and seq not in received:
+            # Reordenação + entrega ordenada por stream: uma perda em um stream
+            # não bloqueia a entrega dos outros
+            stream = streams.get(stream_id)
+            if stream is None:
+                stream = ReceiveStream(stream_id)
+                streams[stream_id] = stream
+            delivered += stream.receive(stream_seq, payload)
+
+            # Avança o ACK cumulativo da conexão
+            if seq == expected_seq:
                 expected_seq += 1
+                while expected_seq in received:
+                    received.remove(expected_seq)
+                    expected_seq += 1
+            else:
+                received.add(seq)
 
-        elif seq > expected_seq:
-            # guarda se ainda não tinha
-            buffer.setdefault(seq, payload)
-
-        else:
-            pass
+        buffered = sum(len(s.buffer) for s in streams.values())
 
-
-        adv_rwnd = max (RECV_BUFFER_PKTS - len(buffer), 0)
+        adv_rwnd = max (RECV_BUFFER_PKTS - buffered, 0)
 
         if adv_rwnd != last_rwnd:
             print(
                 f"[server] rwnd change at expected_seq={expected_seq} | "
-                f"buffer={len(buffer)} rwnd={adv_rwnd}"
+                f"buffer={buffered} rwnd={adv_rwnd}"
             )
             last_rwnd = adv_rwnd
 
@@ -170,14 +175,19 @@ def run_server(host="0.0.0.0", port=9000, packet_loss_rate=0.0):
             loss_rate = (
                 (total_dropped / total_received * 100) if total_received > 0 else 0
             )
+            per_stream = " ".join(
+                f"{s.stream_id}:{s.delivered}" for s in streams.values()
+            )
             print(
-                f"[server] delivered={delivered} expected_seq={expected_seq} buffered={len(buffer)} "
-                f"received={total_received} dropped={total_dropped} ({loss_rate:.1f}%)"
+                f"[server] delivered={delivered} expected_seq={expected_seq} buffered={buffered} "
+                f"received={total_received} dropped={total_dropped} ({loss_rate:.1f}%) "
+                f"streams=[{per_stream}]"
             )
             save_log(
                 SERVER_LOG_DIR,
-                f"delivered={delivered} expected_seq={expected_seq} buffered={len(buffer)} "
-                f"received={total_received} dropped={total_dropped} ({loss_rate:.1f}%)",
+                f"delivered={delivered} expected_seq={expected_seq} buffered={buffered} "
+                f"received={total_received} dropped={total_dropped} ({loss_rate:.1f}%) "
+                f"streams=[{per_stream}]",
             )
 
 
@@ -0,0 +1,110 @@
+class SendStream:
+    """
+    Stream de envio dentro de uma conexão.
+    Cada stream tem seu próprio espaço de sequência (stream_seq), independente
+    do seq da conexão usado para ACK, retransmissão e controle de congestionamento.
+    """
+
+    def __init__(self, stream_id: int, weight: int = 1):
+        self.stream_id = stream_id
+        self.weight = max(int(weight), 1)
+        self.next_seq = 0  # próximo stream_seq a enviar
+        self.pending = 0  # pacotes aguardando envio
+        self.sent = 0  # pacotes já enviados (sem contar retransmissões)
+
+    def write(self, n_packets: int):
+        """Enfileira n_packets pacotes para envio neste stream."""
+        self.pending += n_packets
+
+    def has_pending(self) -> bool:
+        return self.pending > 0
+
+    def take(self) -> int:
+        """Consome o próximo pacote pendente e retorna seu stream_seq."""
+        stream_seq = self.next_seq
+        self.next_seq += 1
+        self.pending -= 1
+        self.sent += 1
+        return stream_seq
+
+
+class StreamScheduler:
+    """
+    Escalonador round-robin ponderado.
+    Decide qual stream ocupa o próximo slot livre da cwnd: cada stream recebe
+    até `weight` slots consecutivos por rodada, e streams sem dados são pulados.
+    """
+
+    def __init__(self):
+        self.streams = {}  # stream_id -> SendStream
+        self.order = []  # ordem de visita do round-robin
+        self.current = 0
+        self.credits = 0  # slots restantes do stream atual nesta rodada
+
+    def add_stream(self, stream_id: int, weight: int = 1) -> SendStream:
+        stream = SendStream(stream_id, weight)
+        self.streams[stream_id] = stream
+        self.order.append(stream_id)
+        if len(self.order) == 1:
+            self.credits = stream.weight
+        return stream
+
+    def has_pending(self) -> bool:
+        return any(s.has_pending() for s in self.streams.values())
+
+    def next_stream(self):
+        """Retorna o próximo SendStream com dados pendentes, ou None."""
+        if not self.order:
+            return None
+
+        # No pior caso visita todos os streams uma vez após o atual
+        for _ in range(len(self.order) + 1):
+            stream = self.streams[self.order[self.current]]
+            if self.credits > 0 and stream.has_pending():
+                self.credits -= 1
+                return stream
+            self._advance()
+
+        return None
+
+    def _advance(self):
+        self.current = (self.current + 1) % len(self.order)
+        self.credits = self.streams[self.order[self.current]].weight
+
+
+class ReceiveStream:
+    """
+    Stream de recepção com reordenação própria.
+    A perda de um pacote só bloqueia a entrega ordenada deste stream;
+    os demais streams da conexão continuam entregando normalmente.
+    """
+
+    def __init__(self, stream_id: int):
+        self.stream_id = stream_id
+        self.expected_seq = 0  # próximo stream_seq a entregar
+        self.buffer = {}  # stream_seq: payload (fora de ordem)
+        self.delivered = 0
+
+    def receive(self, stream_seq: int, payload: bytes) -> int:
+        """
+        Processa um pacote do stream.
+        Retorna quantos pacotes foram entregues em ordem por esta chegada.
+        """
+        if stream_seq == self.expected_seq:
+            # entrega este e todos os consecutivos do buffer
+            count = 1
+            self.expected_seq += 1
+
+            while self.expected_seq in self.buffer:
+                self.buffer.pop(self.expected_seq)
+                count += 1
+                self.expected_seq += 1
+
+            self.delivered += count
+            return count
+
+        if stream_seq > self.expected_seq:
+            # guarda se ainda não tinha
+            self.buffer.setdefault(stream_seq, payload)
+
+        return 0
@@ -6,19 +6,21 @@ from server import SERVER_LOG_DIR, run_server
 import threading
 
 
-def test(total_packets=10000, packet_loss_rate=0.0):
+def test(total_packets=10000, packet_loss_rate=0.0, num_streams=4):
     """
     Testa o protocolo UDP confiável com controle de congestionamento.
 
     Args:
         total_packets: Número de pacotes a enviar (mínimo 10.000)
         packet_loss_rate: Taxa de perda de pacotes (0.0 a 1.0). Ex: 0.1 = 10% de perda
+        num_streams: Número de streams independentes na conexão
     """
     print("\n" + "=" * 80)
     print("TESTE DO PROTOCOLO UDP CONFIÁVEL")
     print("=" * 80)
     print(f"Pacotes a enviar: {total_packets}")
     print(f"Taxa de perda simulada: {packet_loss_rate * 100:.1f}%")
+    print(f"Streams: {num_streams}")
     print("=" * 80 + "\n")
 
     # Limpa os logs anteriores
@@ -30,7 +32,7 @@ def test(total_packets=10000, packet_loss_rate=0.0):
         target=run_server, kwargs={"packet_loss_rate": packet_loss_rate}, daemon=True
     )
     client_thread = threading.Thread(
-        target=run_client, kwargs={"total_packets": total_packets}
+        target=run_client, kwargs={"total_packets": total_packets, "num_streams": num_streams}
     )
 
     server_thread.start()
@@ -53,3 +55,4 @@ if __name__ == "__main__":
     # test(total_packets=10000, packet_loss_rate=0.0)   # Sem perdas
     # test(total_packets=10000, packet_loss_rate=0.05)  # 5% de perda
     # test(total_packets=20000, packet_loss_rate=0.15)  # 20k pacotes, 15% perda
+    # test(total_packets=10000, packet_loss_rate=0.1, num_streams=1)  # Stream único